@@ -13,18 +13,84 @@ Features:
 - Safety protocol enforcement
 """
 
-import argparse
-import json
 import os
+import stat
+import struct
 import sys
 import time
-from datetime import datetime
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, NamedTuple, Optional, Tuple
+
+# Use the orjson C codec when available, falling back to the standard library
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dump_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _write_json(obj: Any):
+        """Write obj as indented JSON to stdout, as bytes when possible."""
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        stream = getattr(sys.stdout, "buffer", None)
+        if stream is None:
+            sys.stdout.write(data.decode())
+        else:
+            sys.stdout.flush()  # Keep ordering with earlier text output
+            stream.write(data)
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dump_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    def _write_json(obj: Any):
+        """Write obj as indented JSON to stdout without building a string."""
+        json.dump(obj, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+# Successful chain validations are remembered here for AUTH_CACHE_TTL seconds
+AUTH_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".adaptivepwm", "auth_cache.json")
+AUTH_CACHE_TTL = 300
+
+# Authenticated instances for this process, keyed by (cert, key, ca) paths,
+# so repeated main() calls from a library or REPL skip re-authentication
+_AUTH_CACHE: Dict[Tuple[str, str, str], "PKIAuthenticator"] = {}
+
+# Simulated monitoring: (parameter, nominal value, noise low, noise high, decimals)
+MONITOR_PROFILE = (
+    ("L_mH", 1.0, -0.1, 0.1, 3),
+    ("C_uF", 10.0, -1.0, 1.0, 2),
+    ("ESR_mOhm", 5.0, -0.5, 0.5, 2),
+    ("duty_cycle", 0.5, -0.1, 0.1, 3),
+    ("efficiency", 0.95, -0.02, 0.01, 4),
+    ("temperature", 25.0, -2.0, 5.0, 1),
+)
+MONITOR_TICKS = 10
+# `start --state-file` publishes live parameters to this per-user memory-mapped
+# file (PARAMETER_NAMES order, native doubles) so other processes can read
+# them without the CLI
+STATE_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.path.expanduser("~"), ".adaptivepwm"),
+    "adaptivepwm.state")
+PARAMETER_NAMES = ("L_mH", "C_uF", "ESR_mOhm", "duty_cycle", "efficiency", "temperature")
+STATE_LAYOUT = struct.Struct(f"={len(PARAMETER_NAMES)}d")
+
+MONITOR_LINE = "📊 L:%smH C:%sµF ESR:%smΩ Duty:%.1f%% Eff:%.1f%% Temp:%s°C"
+
+# Settable parameters with config-defined bounds: parameter -> (min key, max key)
+PARAM_LIMITS = {
+    "duty_cycle": ("min_duty_cycle", "max_duty_cycle"),
+}
 
 class PKIAuthenticator:
     """Handles PKI-based authentication using X.509 certificates."""
     
-    def __init__(self, cert_path: str, key_path: str, ca_path: str):
+    def __init__(self, cert_path: str, key_path: str, ca_path: str,
+                 cache_path: str = AUTH_CACHE_PATH):
         """
         Initialize PKI authenticator.
         
@@ -32,16 +98,22 @@ class PKIAuthenticator:
             cert_path: Path to client certificate
             key_path: Path to private key
             ca_path: Path to CA certificate
+            cache_path: Path to the validation cache file
         """
         self.cert_path = cert_path
         self.key_path = key_path
         self.ca_path = ca_path
+        self.cache_path = cache_path
         self.authenticated = False
+        self._chain_mtimes: Optional[List[int]] = None
         
-    def authenticate(self) -> bool:
+    async def authenticate(self) -> bool:
         """
         Authenticate using X.509 certificates.
         
+        This is a coroutine so certificate validation can overlap with other
+        I/O; synchronous callers use authenticate_sync().
+        
         Returns:
             True if authentication successful, False otherwise
         """
@@ -49,13 +121,22 @@ class PKIAuthenticator:
         # and perform mutual TLS authentication
         try:
             # Check if certificate files exist
-            if not all(os.path.exists(path) for path in [self.cert_path, self.key_path, self.ca_path]):
+            if not self._files_present():
                 print("❌ Authentication failed: Missing certificate files")
                 return False
                 
+            # Skip chain validation if this exact chain passed recently
+            chain_key, mtimes = self._chain_fingerprint()
+            if self._is_cached(chain_key, mtimes):
+                self.authenticated = True
+                self._chain_mtimes = mtimes
+                print("✅ Authentication successful (cached)")
+                return True
+                
             # Simulate certificate validation (in real implementation, use OpenSSL)
             print(f"🔐 Authenticating with certificate: {os.path.basename(self.cert_path)}")
-            time.sleep(0.5)  # Simulate network delay
+            import asyncio
+            await asyncio.sleep(0.5)  # Simulate network delay
             
             # In real implementation:
             # - Verify certificate against CA
@@ -64,18 +145,121 @@ class PKIAuthenticator:
             # - Perform mutual authentication
             
             self.authenticated = True
+            self._chain_mtimes = mtimes
+            self._store_cached(chain_key, mtimes)
             print("✅ Authentication successful")
             return True
         except Exception as e:
             print(f"❌ Authentication failed: {str(e)}")
             return False
             
+    def authenticate_sync(self) -> bool:
+        """
+        Authenticate from synchronous code by running authenticate().
+        
+        Returns:
+            True if authentication successful, False otherwise
+        """
+        import asyncio
+        return asyncio.run(self.authenticate())
+        
+    def is_current(self) -> bool:
+        """Check a past authentication still matches the certificates on disk."""
+        if not self.authenticated or self._chain_mtimes is None:
+            return False
+        try:
+            mtimes = [os.stat(path).st_mtime_ns
+                      for path in (self.cert_path, self.key_path, self.ca_path)]
+        except OSError:
+            return False
+        return mtimes == self._chain_mtimes
+        
+    def _files_present(self) -> bool:
+        """
+        Check the certificate files exist using one listing per directory.
+        
+        A directory that can be searched but not listed (e.g. mode 0711)
+        falls back to checking each of its files with os.path.exists().
+        """
+        listings: Dict[str, Optional[set]] = {}
+        for path in (self.cert_path, self.key_path, self.ca_path):
+            parent, name = os.path.split(path)
+            if parent not in listings:
+                try:
+                    with os.scandir(parent or ".") as entries:
+                        listings[parent] = {entry.name for entry in entries}
+                except PermissionError:
+                    listings[parent] = None
+                except OSError:
+                    return False
+            names = listings[parent]
+            if not (os.path.exists(path) if names is None else name in names):
+                return False
+        return True
+        
+    def _chain_fingerprint(self) -> Tuple[str, List[int]]:
+        """
+        Hash the client and CA certificates.
+        
+        Returns:
+            Hex digest, and the mtimes of the certificate, private key and
+            CA files so replacing any of them invalidates cached results
+        """
+        import hashlib
+        digest = hashlib.sha256()
+        with open(self.cert_path, 'rb') as f:
+            cert_mtime = os.fstat(f.fileno()).st_mtime_ns
+            digest.update(f.read())
+        with open(self.ca_path, 'rb') as f:
+            ca_mtime = os.fstat(f.fileno()).st_mtime_ns
+            digest.update(f.read())
+        key_mtime = os.stat(self.key_path).st_mtime_ns
+        return digest.hexdigest(), [cert_mtime, key_mtime, ca_mtime]
+        
+    def _read_cache(self) -> Dict[str, Any]:
+        """Read the validation cache, treating any error as an empty cache."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = _loads(f.read())
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+            
+    @staticmethod
+    def _is_fresh(entry: Any, now: float) -> bool:
+        """Check a cache entry is well-formed and within AUTH_CACHE_TTL."""
+        if not isinstance(entry, dict):
+            return False
+        validated_at = entry.get("validated_at")
+        if not isinstance(validated_at, (int, float)):
+            return False
+        return 0 <= now - validated_at < AUTH_CACHE_TTL
+        
+    def _is_cached(self, chain_key: str, mtimes: List[int]) -> bool:
+        """Check for an unexpired validation of the same chain."""
+        entry = self._read_cache().get(chain_key)
+        return self._is_fresh(entry, time.time()) and entry.get("mtimes") == mtimes
+        
+    def _store_cached(self, chain_key: str, mtimes: List[int]):
+        """Record a successful validation, pruning expired and malformed entries."""
+        now = time.time()
+        cache = {k: v for k, v in self._read_cache().items() if self._is_fresh(v, now)}
+        cache[chain_key] = {"validated_at": now, "mtimes": mtimes}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", mode=0o700, exist_ok=True)
+            fd = os.open(self.cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dump_bytes(cache))
+        except OSError:
+            pass  # Cache is best effort; authentication already succeeded
+            
     def get_user_info(self) -> Dict[str, Any]:
         """Get authenticated user information."""
         if not self.authenticated:
             return {}
             
         # In real implementation, extract user info from certificate
+        from datetime import datetime
         return {
             "user": "admin",
             "organization": "LTT Sweden",
@@ -83,19 +267,71 @@ class PKIAuthenticator:
             "cert_subject": "CN=admin,O=LTT Sweden,C=SE"
         }
 
+def read_state(path: str = STATE_PATH) -> Optional[Dict[str, float]]:
+    """
+    Read the parameters published by a monitoring controller.
+    
+    Args:
+        path: Shared state file
+        
+    Returns:
+        Snapshot of the parameters, or None if no valid state file exists
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(STATE_LAYOUT.size + 1)
+    except OSError:
+        return None
+    if len(data) != STATE_LAYOUT.size:
+        return None
+    return dict(zip(PARAMETER_NAMES, STATE_LAYOUT.unpack(data)))
+
+class SafetyLimits(NamedTuple):
+    """Safety limits, frozen from the configuration when it is loaded."""
+    max_temperature: float = 85
+    max_current: float = 10.0
+    max_voltage: float = 24.0
+    
+    @classmethod
+    def from_config(cls, limits: Mapping[str, Any]) -> "SafetyLimits":
+        """Build from a safety_limits mapping, ignoring unknown keys."""
+        return cls(**{name: limits[name] for name in cls._fields if name in limits})
+
+class ParameterRange(NamedTuple):
+    """Inclusive bounds for a settable parameter."""
+    low: float
+    high: float
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Format a time.time_ns() timestamp as local ISO-8601."""
+    from datetime import datetime
+    # Integer split: a float of the full value can round to the wrong microsecond
+    seconds, nanoseconds = divmod(timestamp_ns, 10**9)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000).isoformat()
+
 class AdaptivePWMController:
     """Main controller for AdaptivePWM system."""
     
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json",
+                 state_path: Optional[str] = None):
         """
         Initialize controller.
         
         Args:
             config_path: Path to configuration file
+            state_path: File that start_monitoring publishes live parameters
+                to (e.g. STATE_PATH), or None to not publish them
         """
         self.config_path = config_path
+        # Bytes and _file_stamp() of the config file as last read or written
+        self._saved_data: Optional[bytes] = None
+        self._saved_stat: Optional[Tuple[int, ...]] = None
         self.config = self._load_config()
         self.running = False
+        self._stop_event: Optional["asyncio.Event"] = None
+        self.state_path = state_path
+        # A plain dict rather than a __slots__ store: set_parameter and
+        # get_status's read-only view both need name-keyed access
         self.parameters = {
             "L_mH": 0.0,
             "C_uF": 0.0,
@@ -104,77 +340,179 @@ class AdaptivePWMController:
             "efficiency": 0.0,
             "temperature": 25.0
         }
+        self._parameters_view = MappingProxyType(self.parameters)
+        self._limits = {param: ParameterRange(self.config[low], self.config[high])
+                        for param, (low, high) in PARAM_LIMITS.items()}
+        self.safety = SafetyLimits.from_config(self.config["safety_limits"])
         
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file."""
-        default_config = {
+        # Limits as reported by check_safety, converted once
+        self._safety_limits = self.safety._asdict()
+        
+    @staticmethod
+    def _default_config() -> Dict[str, Any]:
+        """Build a fresh copy of the built-in configuration."""
+        return {
             "pwm_frequency": 20000,
             "max_duty_cycle": 0.95,
             "min_duty_cycle": 0.05,
             "target_efficiency": 0.95,
             "sampling_rate": 100,
-            "safety_limits": {
-                "max_temperature": 85,
-                "max_current": 10.0,
-                "max_voltage": 24.0
-            }
+            "safety_limits": SafetyLimits()._asdict()
         }
         
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    return {**default_config, **json.load(f)}
-            except Exception as e:
-                print(f"⚠️  Config load error: {e}, using defaults")
-                return default_config
-        else:
+    @staticmethod
+    def _file_stamp(st: os.stat_result) -> Tuple[int, ...]:
+        """Identify a file version by device, inode, mtime and size."""
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        
+    def _load_config(self) -> Dict[str, Any]:
+        """Load configuration from file, merged over the built-in defaults."""
+        try:
+            with open(self.config_path, 'rb') as f:
+                stamp = self._file_stamp(os.fstat(f.fileno()))
+                raw = f.read()
+            config = {**self._default_config(), **_loads(raw)}
+            if not isinstance(config["safety_limits"], dict):
+                raise ValueError("safety_limits must be a JSON object")
+            self._saved_data, self._saved_stat = raw, stamp
+            return config
+        except FileNotFoundError:
             print("ℹ️  Using default configuration")
-            return default_config
+            return self._default_config()
+        except Exception as e:
+            print(f"⚠️  Config load error: {e}, using defaults")
+            return self._default_config()
             
+    def _open_state(self):
+        """
+        Map the state file for publishing.
+        
+        Only a regular file owned by this user and not writable by others
+        is accepted; anything else is refused so no other account can
+        inject values.
+        
+        Returns:
+            Writable mmap of the state file, or None if it cannot be used
+        """
+        import mmap
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", mode=0o700, exist_ok=True)
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        except OSError as e:
+            print(f"⚠️  Not publishing state: {e}")
+            return None
+        try:
+            st = os.fstat(fd)
+            getuid = getattr(os, "getuid", None)
+            if (not stat.S_ISREG(st.st_mode) or st.st_mode & 0o022
+                    or (getuid is not None and st.st_uid != getuid())):
+                print(f"⚠️  Not publishing state: {self.state_path} is not a private file of this user")
+                return None
+            if st.st_size != STATE_LAYOUT.size:
+                os.ftruncate(fd, STATE_LAYOUT.size)
+            return mmap.mmap(fd, STATE_LAYOUT.size)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Not publishing state: {e}")
+            return None
+        finally:
+            os.close(fd)
+        
     def save_config(self):
-        """Save current configuration to file."""
+        """
+        Save current configuration to file.
+        
+        The write is skipped when the file on disk is still exactly what
+        this instance last read or wrote and matches the current config.
+        """
+        data = _dump_bytes(self.config)
+        if data == self._saved_data:
+            try:
+                unchanged = self._file_stamp(os.stat(self.config_path)) == self._saved_stat
+            except OSError:
+                unchanged = False
+            if unchanged:
+                print("ℹ️  Configuration unchanged, nothing to save")
+                return
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with open(self.config_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                stamp = self._file_stamp(os.fstat(f.fileno()))
+            self._saved_data, self._saved_stat = data, stamp
             print("✅ Configuration saved")
         except Exception as e:
             print(f"❌ Failed to save configuration: {e}")
             
-    def start_monitoring(self):
-        """Start monitoring system parameters."""
+    async def start_monitoring(self):
+        """Start monitoring system parameters until stopped or Ctrl-C."""
+        import asyncio
+        import signal
         print("▶️  Starting monitoring...")
         self.running = True
+        self._stop_event = asyncio.Event()
         
-        # Simulate parameter updates
+        # Simulate realistic parameter changes, generated for all ticks up front
         import random
-        for i in range(10):
-            if not self.running:
-                break
-                
-            # Simulate realistic parameter changes
-            self.parameters["L_mH"] = round(1.0 + random.uniform(-0.1, 0.1), 3)
-            self.parameters["C_uF"] = round(10.0 + random.uniform(-1.0, 1.0), 2)
-            self.parameters["ESR_mOhm"] = round(5.0 + random.uniform(-0.5, 0.5), 2)
-            self.parameters["duty_cycle"] = round(0.5 + random.uniform(-0.1, 0.1), 3)
-            self.parameters["efficiency"] = round(0.95 + random.uniform(-0.02, 0.01), 4)
-            self.parameters["temperature"] = round(25.0 + random.uniform(-2.0, 5.0), 1)
-            
-            print(f"📊 L:{self.parameters['L_mH']}mH C:{self.parameters['C_uF']}µF ESR:{self.parameters['ESR_mOhm']}mΩ "
-                  f"Duty:{self.parameters['duty_cycle']:.1%} Eff:{self.parameters['efficiency']:.1%} "
-                  f"Temp:{self.parameters['temperature']}°C")
+        uniform = random.uniform
+        names = [name for name, *_ in MONITOR_PROFILE]
+        samples = [
+            [round(base + uniform(low, high), decimals)
+             for _, base, low, high, decimals in MONITOR_PROFILE]
+            for _ in range(MONITOR_TICKS)
+        ]
+        
+        state = self._open_state() if self.state_path is not None else None
+        
+        # Let Ctrl-C wake the tick wait instead of raising KeyboardInterrupt
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.stop_monitoring)
+            sigint_handled = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            sigint_handled = False  # Unsupported platform or not the main thread
             
-            time.sleep(1)
+        try:
+            for sample in samples:
+                if not self.running:
+                    break
+                    
+                params = self.parameters
+                params.update(zip(names, sample))
+                if state is not None:
+                    STATE_LAYOUT.pack_into(state, 0, *(params[name] for name in PARAMETER_NAMES))
+                
+                print(MONITOR_LINE % (params["L_mH"], params["C_uF"], params["ESR_mOhm"],
+                                      params["duty_cycle"] * 100, params["efficiency"] * 100,
+                                      params["temperature"]))
+                
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), 1)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if sigint_handled:
+                loop.remove_signal_handler(signal.SIGINT)
+            if state is not None:
+                state.close()
             
     def stop_monitoring(self):
-        """Stop monitoring system parameters."""
+        """Stop monitoring system parameters, waking a pending tick wait."""
         print("⏹️  Stopping monitoring...")
         self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
         
     def get_status(self) -> Dict[str, Any]:
-        """Get current system status."""
+        """
+        Get current system status.
+        
+        The timestamp is raw nanoseconds from time.time_ns(); use
+        format_timestamp() when presenting it. Parameters are a live
+        read-only view; take dict() of it when a snapshot is needed.
+        """
         return {
-            "timestamp": datetime.now().isoformat(),
-            "parameters": self.parameters.copy(),
+            "timestamp": time.time_ns(),
+            "parameters": self._parameters_view,
             "config": self.config,
             "running": self.running
         }
@@ -192,11 +530,12 @@ class AdaptivePWMController:
         """
         if param in self.parameters:
             # Validate parameter limits
-            if param == "duty_cycle":
-                if value < self.config["min_duty_cycle"] or value > self.config["max_duty_cycle"]:
-                    print(f"❌ Duty cycle must be between {self.config['min_duty_cycle']} and {self.config['max_duty_cycle']}")
-                    return False
-                    
+            limits = self._limits.get(param)
+            if limits is not None and not limits.low <= value <= limits.high:
+                label = param.replace("_", " ").capitalize()
+                print(f"❌ {label} must be between {limits.low} and {limits.high}")
+                return False
+                
             self.parameters[param] = value
             print(f"✅ Set {param} = {value}")
             return True
@@ -208,118 +547,184 @@ class AdaptivePWMController:
         """Check safety limits."""
         violations = []
         
-        if self.parameters["temperature"] > self.config["safety_limits"]["max_temperature"]:
-            violations.append(f"High temperature: {self.parameters['temperature']}°C")
+        temperature = self.parameters["temperature"]
+        if temperature > self.safety.max_temperature:
+            violations.append(f"High temperature: {temperature}°C")
             
         return {
-            "safe": len(violations) == 0,
+            "safe": not violations,
             "violations": violations,
-            "limits": self.config["safety_limits"]
+            "limits": dict(self._safety_limits)
         }
 
 def create_pki_structure():
     """Create basic PKI structure for demonstration."""
     pki_dir = "pki"
-    if not os.path.exists(pki_dir):
-        os.makedirs(pki_dir)
+    os.makedirs(pki_dir, exist_ok=True)
         
     # In a real implementation, this would generate proper certificates
-    # For demo purposes, we'll create placeholder files
+    # For demo purposes, we'll create placeholder files; O_EXCL leaves
+    # existing files untouched without a separate exists() check
     placeholders = ["client.crt", "client.key", "ca.crt"]
     for filename in placeholders:
         filepath = os.path.join(pki_dir, filename)
-        if not os.path.exists(filepath):
-            with open(filepath, "w") as f:
-                f.write(f"# Placeholder {filename}\n")
+        try:
+            fd = os.open(filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            continue
+        try:
+            os.write(fd, f"# Placeholder {filename}\n".encode())
+        finally:
+            os.close(fd)
                 
     print(f"📁 Created PKI structure in {pki_dir}/")
 
-def main():
-    """Main entry point."""
-    parser = argparse.ArgumentParser(description="AdaptivePWM CLI Controller")
+def _start_arguments(parser):
+    """Add start arguments."""
+    parser.add_argument("--state-file", nargs="?", const=STATE_PATH, metavar="PATH",
+                        help=f"Publish live parameters to PATH (default: {STATE_PATH})")
+
+def _status_arguments(parser):
+    """Add status arguments."""
+    parser.add_argument("--json", action="store_true", help="Output in JSON format")
+
+def _set_arguments(parser):
+    """Add set arguments."""
+    parser.add_argument("parameter", help="Parameter to set")
+    parser.add_argument("value", type=float, help="Value to set")
+
+def _config_arguments(parser):
+    """Add config arguments."""
+    parser.add_argument("--show", action="store_true", help="Show current configuration")
+    parser.add_argument("--save", action="store_true", help="Save current configuration")
+
+def _cmd_init(controller: Optional[AdaptivePWMController], args):
+    """Handle the init command."""
+    create_pki_structure()
+
+def _cmd_start(controller: AdaptivePWMController, args):
+    """Handle the start command."""
+    import asyncio
+    controller.state_path = args.state_file
+    asyncio.run(controller.start_monitoring())
+
+def _cmd_stop(controller: AdaptivePWMController, args):
+    """Handle the stop command."""
+    controller.stop_monitoring()
+
+def _cmd_status(controller: AdaptivePWMController, args):
+    """Handle the status command."""
+    status = controller.get_status()
+    status["timestamp"] = format_timestamp(status["timestamp"])
+    if args.json:
+        status["parameters"] = dict(status["parameters"])
+        _write_json(status)
+    else:
+        print(f"⏱️  Timestamp: {status['timestamp']}")
+        print(f"🔄 Running: {'Yes' if status['running'] else 'No'}")
+        print("\n📊 Parameters:")
+        for key, value in status['parameters'].items():
+            print(f"  {key}: {value}")
+
+def _cmd_set(controller: AdaptivePWMController, args):
+    """Handle the set command."""
+    controller.set_parameter(args.parameter, args.value)
+
+def _cmd_config(controller: AdaptivePWMController, args):
+    """Handle the config command."""
+    if args.show:
+        _write_json(controller.config)
+    elif args.save:
+        controller.save_config()
+    else:
+        print("ℹ️  Use --show or --save with config command")
+
+def _cmd_safety(controller: AdaptivePWMController, args):
+    """Handle the safety command."""
+    safety = controller.check_safety()
+    if safety["safe"]:
+        print("✅ System is operating within safety limits")
+    else:
+        print("⚠️  Safety violations detected:")
+        for violation in safety["violations"]:
+            print(f"  - {violation}")
+
+# Command dispatch table: name -> (handler, argument builder, help text, requires authentication).
+# Only the invoked command's parser is built, instead of one subparser per command.
+COMMANDS = {
+    "start": (_cmd_start, _start_arguments, "Start monitoring", True),
+    "stop": (_cmd_stop, None, "Stop monitoring", True),
+    "status": (_cmd_status, _status_arguments, "Get system status", True),
+    "set": (_cmd_set, _set_arguments, "Set parameter value", True),
+    "config": (_cmd_config, _config_arguments, "Manage configuration", True),
+    "init": (_cmd_init, None, "Initialize PKI structure", False),
+    "safety": (_cmd_safety, None, "Check safety status", True),
+}
+
+def _build_parser():
+    """Build the top-level parser; command arguments are left unparsed."""
+    import argparse
+    commands = "\n".join(f"  {name:<10} {help_text}"
+                         for name, (_, _, help_text, _) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        description="AdaptivePWM CLI Controller",
+        epilog=f"commands:\n{commands}",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("-c", "--config", default="config.json", help="Configuration file path")
     parser.add_argument("--cert", default="pki/client.crt", help="Client certificate path")
     parser.add_argument("--key", default="pki/client.key", help="Private key path")
     parser.add_argument("--ca", default="pki/ca.crt", help="CA certificate path")
-    
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
-    # Start command
-    subparsers.add_parser("start", help="Start monitoring")
-    
-    # Stop command
-    subparsers.add_parser("stop", help="Stop monitoring")
-    
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Get system status")
-    status_parser.add_argument("--json", action="store_true", help="Output in JSON format")
-    
-    # Set command
-    set_parser = subparsers.add_parser("set", help="Set parameter value")
-    set_parser.add_argument("parameter", help="Parameter to set")
-    set_parser.add_argument("value", type=float, help="Value to set")
-    
-    # Config command
-    config_parser = subparsers.add_parser("config", help="Manage configuration")
-    config_parser.add_argument("--show", action="store_true", help="Show current configuration")
-    config_parser.add_argument("--save", action="store_true", help="Save current configuration")
-    
-    # Init command
-    subparsers.add_parser("init", help="Initialize PKI structure")
-    
-    # Safety command
-    subparsers.add_parser("safety", help="Check safety status")
-    
-    args = parser.parse_args()
-    
-    # Handle init command separately
-    if args.command == "init":
+    parser.add_argument("command", nargs="?", choices=COMMANDS, help="Command to run")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser
+
+def _parse_command(prog: str, command: str, argv: List[str]):
+    """Parse the arguments of a single command."""
+    import argparse
+    _, add_arguments, help_text, _ = COMMANDS[command]
+    parser = argparse.ArgumentParser(prog=f"{prog} {command}", description=help_text)
+    if add_arguments is not None:
+        add_arguments(parser)
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # A bare init needs neither authentication nor a parser
+    if argv == ["init"]:
         create_pki_structure()
         return
+
+    parser = _build_parser()
+    options = parser.parse_args(argv)
+    if options.command is None:
+        parser.print_help()
+        return
+    handler, _, _, requires_auth = COMMANDS[options.command]
+    args = _parse_command(parser.prog, options.command, options.args)
+    
+    # init needs neither a controller nor authentication
+    if not requires_auth:
+        handler(None, args)
+        return
     
     # Initialize controller and authenticator
-    controller = AdaptivePWMController(args.config)
-    authenticator = PKIAuthenticator(args.cert, args.key, args.ca)
+    controller = AdaptivePWMController(options.config)
+    auth_key = (options.cert, options.key, options.ca)
+    authenticator = _AUTH_CACHE.get(auth_key)
     
     # Require authentication for all commands except init
-    if not authenticator.authenticate():
-        print("🔒 Authentication required to access AdaptivePWM system")
-        sys.exit(1)
-    
-    # Handle commands
-    if args.command == "start":
-        controller.start_monitoring()
-    elif args.command == "stop":
-        controller.stop_monitoring()
-    elif args.command == "status":
-        status = controller.get_status()
-        if args.json:
-            print(json.dumps(status, indent=2))
-        else:
-            print(f"⏱️  Timestamp: {status['timestamp']}")
-            print(f"🔄 Running: {'Yes' if status['running'] else 'No'}")
-            print("\n📊 Parameters:")
-            for key, value in status['parameters'].items():
-                print(f"  {key}: {value}")
-    elif args.command == "set":
-        controller.set_parameter(args.parameter, args.value)
-    elif args.command == "config":
-        if args.show:
-            print(json.dumps(controller.config, indent=2))
-        elif args.save:
-            controller.save_config()
-        else:
-            print("ℹ️  Use --show or --save with config command")
-    elif args.command == "safety":
-        safety = controller.check_safety()
-        if safety["safe"]:
-            print("✅ System is operating within safety limits")
-        else:
-            print("⚠️  Safety violations detected:")
-            for violation in safety["violations"]:
-                print(f"  - {violation}")
-    else:
-        parser.print_help()
+    if authenticator is None or not authenticator.is_current():
+        authenticator = PKIAuthenticator(*auth_key)
+        if not authenticator.authenticate_sync():
+            _AUTH_CACHE.pop(auth_key, None)
+            print("🔒 Authentication required to access AdaptivePWM system")
+            sys.exit(1)
+        _AUTH_CACHE[auth_key] = authenticator
+        
+    handler(controller, args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,402 @@
+# Unit tests for the AdaptivePWM CLI (cli/pwm_cli.py)
+# Run with: python3 -m pytest test_pwm_cli.py -v
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+import pwm_cli
+
+AUTHENTICATE = pwm_cli.PKIAuthenticator.authenticate
+
+@pytest.fixture(autouse=True)
+def cli_env(tmp_path, monkeypatch):
+    """Run each test in a scratch directory with authentication stubbed out."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pwm_cli, "_AUTH_CACHE", {})
+
+    async def authenticate(self):
+        self.authenticated = True
+        return True
+
+    monkeypatch.setattr(pwm_cli.PKIAuthenticator, "authenticate", authenticate)
+    return tmp_path
+
+def deny_authentication(monkeypatch):
+    """Make any authentication attempt fail the test."""
+    async def authenticate(self):
+        raise AssertionError("authentication should not be attempted")
+
+    monkeypatch.setattr(pwm_cli.PKIAuthenticator, "authenticate", authenticate)
+
+def run(capsys, *argv):
+    """Run main() and return (exit code, stdout, stderr)."""
+    try:
+        pwm_cli.main(list(argv))
+        code = 0
+    except SystemExit as e:
+        code = e.code
+    out, err = capsys.readouterr()
+    return code, out, err
+
+def parse_json(out):
+    """Extract the JSON document following any status lines."""
+    return json.loads(out[out.index("{"):])
+
+class TestDispatch:
+    def test_set_parameter(self, capsys):
+        code, out, _ = run(capsys, "set", "duty_cycle", "0.3")
+        assert code == 0
+        assert "✅ Set duty_cycle = 0.3" in out
+
+    def test_set_out_of_range(self, capsys):
+        code, out, _ = run(capsys, "set", "duty_cycle", "0.99")
+        assert code == 0
+        assert "❌ Duty cycle must be between 0.05 and 0.95" in out
+
+    def test_status_json(self, capsys):
+        code, out, _ = run(capsys, "status", "--json")
+        assert code == 0
+        status = parse_json(out)
+        assert status["running"] is False
+        assert status["parameters"]["duty_cycle"] == 0.5
+
+    def test_safety(self, capsys):
+        code, out, _ = run(capsys, "safety")
+        assert code == 0
+        assert "✅ System is operating within safety limits" in out
+
+    def test_config_long_option(self, capsys, cli_env):
+        (cli_env / "foo.json").write_text('{"sampling_rate": 7}')
+        code, out, _ = run(capsys, "--config", "foo.json", "config", "--show")
+        assert code == 0
+        assert parse_json(out)["sampling_rate"] == 7
+
+    def test_config_attached_short_option(self, capsys, cli_env):
+        (cli_env / "foo.json").write_text('{"sampling_rate": 7}')
+        code, out, _ = run(capsys, "-cfoo.json", "config", "--show")
+        assert code == 0
+        assert parse_json(out)["sampling_rate"] == 7
+
+    def test_config_option_prefix(self, capsys, cli_env):
+        (cli_env / "foo.json").write_text('{"sampling_rate": 7}')
+        code, out, _ = run(capsys, "--conf", "foo.json", "config", "--show")
+        assert code == 0
+        assert parse_json(out)["sampling_rate"] == 7
+
+    def test_config_without_flags(self, capsys):
+        code, out, _ = run(capsys, "config")
+        assert code == 0
+        assert "Use --show or --save" in out
+
+    def test_init_skips_authentication(self, capsys, cli_env, monkeypatch):
+        deny_authentication(monkeypatch)
+        code, out, _ = run(capsys, "init")
+        assert code == 0
+        assert sorted(os.listdir(cli_env / "pki")) == ["ca.crt", "client.crt", "client.key"]
+
+    def test_init_skips_parser(self, capsys, cli_env, monkeypatch):
+        def build_parser():
+            raise AssertionError("init should not build a parser")
+
+        monkeypatch.setattr(pwm_cli, "_build_parser", build_parser)
+        code, out, _ = run(capsys, "init")
+        assert code == 0
+        assert "📁 Created PKI structure in pki/" in out
+
+    def test_authentication_failure(self, capsys, monkeypatch):
+        async def authenticate(self):
+            return False
+
+        monkeypatch.setattr(pwm_cli.PKIAuthenticator, "authenticate", authenticate)
+        code, out, _ = run(capsys, "status")
+        assert code == 1
+        assert "🔒 Authentication required" in out
+
+class TestAuthentication:
+    @pytest.fixture
+    def authenticator(self, cli_env, monkeypatch):
+        """Real authentication against placeholder certificates, without the delay."""
+        async def sleep(delay):
+            pass
+
+        monkeypatch.setattr(pwm_cli.PKIAuthenticator, "authenticate", AUTHENTICATE)
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        pwm_cli.create_pki_structure()
+        return pwm_cli.PKIAuthenticator("pki/client.crt", "pki/client.key", "pki/ca.crt",
+                                        cache_path=str(cli_env / "auth_cache.json"))
+
+    def test_sync_success(self, authenticator):
+        assert authenticator.authenticate_sync() is True
+        assert authenticator.authenticated
+
+    def test_sync_missing_files(self, authenticator, capsys):
+        authenticator.cert_path = "pki/missing.crt"
+        assert authenticator.authenticate_sync() is False
+        assert "Missing certificate files" in capsys.readouterr().out
+
+    def test_unlistable_directory(self, authenticator, capsys, monkeypatch):
+        def scandir(path):
+            raise PermissionError(13, "Permission denied", path)
+
+        monkeypatch.setattr(pwm_cli.os, "scandir", scandir)
+        assert authenticator.authenticate_sync()
+        authenticator.key_path = "pki/missing.key"
+        assert not authenticator.authenticate_sync()
+        assert "Missing certificate files" in capsys.readouterr().out
+
+    def test_cache_hit(self, authenticator, capsys):
+        assert authenticator.authenticate_sync()
+        assert "(cached)" not in capsys.readouterr().out
+        assert authenticator.authenticate_sync()
+        assert "✅ Authentication successful (cached)" in capsys.readouterr().out
+
+    def test_cache_expires(self, authenticator, capsys, monkeypatch):
+        assert authenticator.authenticate_sync()
+        now = pwm_cli.time.time()
+        monkeypatch.setattr(pwm_cli.time, "time", lambda: now + pwm_cli.AUTH_CACHE_TTL + 1)
+        capsys.readouterr()
+        assert authenticator.authenticate_sync()
+        assert "(cached)" not in capsys.readouterr().out
+
+    def test_cache_invalidated_by_key_change(self, authenticator, capsys):
+        assert authenticator.authenticate_sync()
+        st = os.stat("pki/client.key")
+        os.utime("pki/client.key", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        capsys.readouterr()
+        assert authenticator.authenticate_sync()
+        assert "(cached)" not in capsys.readouterr().out
+
+    @pytest.mark.parametrize("validated_at", ["x", None, [1]])
+    def test_malformed_cache_entry(self, authenticator, capsys, validated_at):
+        assert authenticator.authenticate_sync()
+        with open(authenticator.cache_path) as f:
+            cache = json.load(f)
+        for entry in cache.values():
+            entry["validated_at"] = validated_at
+        cache["other"] = {"validated_at": validated_at, "mtimes": []}
+        with open(authenticator.cache_path, "w") as f:
+            json.dump(cache, f)
+        capsys.readouterr()
+        assert authenticator.authenticate_sync()
+        assert "(cached)" not in capsys.readouterr().out
+        with open(authenticator.cache_path) as f:
+            cache = json.load(f)
+        assert "other" not in cache
+        assert authenticator.authenticate_sync()
+        assert "(cached)" in capsys.readouterr().out
+
+    def test_unreadable_cache_file(self, authenticator, capsys):
+        with open(authenticator.cache_path, "w") as f:
+            f.write("{not json")
+        assert authenticator.authenticate_sync()
+        assert "(cached)" not in capsys.readouterr().out
+        assert authenticator.authenticate_sync()
+        assert "(cached)" in capsys.readouterr().out
+
+class TestConfig:
+    def test_same_relative_path_in_another_directory(self, cli_env, monkeypatch):
+        for name, rate in (("a", 1), ("b", 2)):
+            directory = cli_env / name
+            directory.mkdir()
+            (directory / "config.json").write_text(f'{{"sampling_rate": {rate}}}')
+            os.utime(directory / "config.json", ns=(0, 0))
+        monkeypatch.chdir(cli_env / "a")
+        assert pwm_cli.AdaptivePWMController().config["sampling_rate"] == 1
+        monkeypatch.chdir(cli_env / "b")
+        assert pwm_cli.AdaptivePWMController().config["sampling_rate"] == 2
+
+class TestFormatTimestamp:
+    def test_microseconds_are_exact(self):
+        from datetime import datetime
+        expected = datetime.fromtimestamp(1636378608).replace(microsecond=205740)
+        assert pwm_cli.format_timestamp(1636378608205740996) == expected.isoformat()
+
+class TestSaveConfig:
+    def test_missing_at_load_is_written(self, cli_env, capsys):
+        controller = pwm_cli.AdaptivePWMController()
+        controller.save_config()
+        assert "✅ Configuration saved" in capsys.readouterr().out
+        with open("config.json") as f:
+            assert json.load(f) == controller.config
+
+    def test_unchanged_is_skipped(self, cli_env, capsys):
+        pwm_cli.AdaptivePWMController().save_config()
+        st = os.stat("config.json")
+        os.utime("config.json", ns=(st.st_atime_ns, 0))
+        controller = pwm_cli.AdaptivePWMController()
+        capsys.readouterr()
+        controller.save_config()
+        controller.save_config()
+        assert capsys.readouterr().out.count("Configuration unchanged") == 2
+        assert os.stat("config.json").st_mtime_ns == 0
+
+    def test_changed_config_is_written(self, cli_env, capsys):
+        pwm_cli.AdaptivePWMController().save_config()
+        controller = pwm_cli.AdaptivePWMController()
+        controller.config["sampling_rate"] = 7
+        capsys.readouterr()
+        controller.save_config()
+        assert "✅ Configuration saved" in capsys.readouterr().out
+        with open("config.json") as f:
+            assert json.load(f)["sampling_rate"] == 7
+
+    def test_external_edit_is_overwritten(self, cli_env, capsys):
+        pwm_cli.AdaptivePWMController().save_config()
+        controller = pwm_cli.AdaptivePWMController()
+        with open("config.json", "w") as f:
+            f.write('{"sampling_rate": 1}')
+        capsys.readouterr()
+        controller.save_config()
+        assert "✅ Configuration saved" in capsys.readouterr().out
+        with open("config.json") as f:
+            assert json.load(f) == controller.config
+
+class TestStateFile:
+    @pytest.fixture
+    def controller(self, cli_env):
+        return pwm_cli.AdaptivePWMController(state_path=str(cli_env / "state"))
+
+    def test_start_publishes_state(self, cli_env, capsys, monkeypatch):
+        async def wait_for(awaitable, timeout):
+            awaitable.close()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(pwm_cli, "MONITOR_TICKS", 1)
+        monkeypatch.setattr(asyncio, "wait_for", wait_for)
+        state_path = str(cli_env / "state")
+        code, _, _ = run(capsys, "start", "--state-file", state_path)
+        assert code == 0
+        assert os.stat(state_path).st_mode & 0o777 == 0o600
+        state = pwm_cli.read_state(state_path)
+        assert list(state) == list(pwm_cli.PARAMETER_NAMES)
+        assert 0.4 <= state["duty_cycle"] <= 0.6
+
+    def test_start_without_state_file(self, cli_env, capsys, monkeypatch):
+        monkeypatch.setattr(pwm_cli, "MONITOR_TICKS", 0)
+        monkeypatch.setattr(pwm_cli, "STATE_PATH", str(cli_env / "state"))
+        code, _, _ = run(capsys, "start")
+        assert code == 0
+        assert not os.path.exists(cli_env / "state")
+
+    def test_private_file_is_mapped(self, controller):
+        state = controller._open_state()
+        assert state is not None
+        state.close()
+
+    def test_symlink_is_refused(self, controller, cli_env, capsys):
+        target = cli_env / "target"
+        target.write_bytes(b"keep")
+        os.symlink(target, controller.state_path)
+        assert controller._open_state() is None
+        assert "Not publishing state" in capsys.readouterr().out
+        assert target.read_bytes() == b"keep"
+
+    def test_group_writable_file_is_refused(self, controller, capsys):
+        with open(controller.state_path, "wb") as f:
+            f.write(b"keep")
+        os.chmod(controller.state_path, 0o660)
+        assert controller._open_state() is None
+        assert "is not a private file of this user" in capsys.readouterr().out
+        with open(controller.state_path, "rb") as f:
+            assert f.read() == b"keep"
+
+    def test_read_state_rejects_missing_or_truncated(self, cli_env):
+        path = cli_env / "state"
+        assert pwm_cli.read_state(str(path)) is None
+        path.write_bytes(b"\0" * (pwm_cli.STATE_LAYOUT.size - 1))
+        assert pwm_cli.read_state(str(path)) is None
+
+class TestSafety:
+    def test_results_are_independent(self):
+        controller = pwm_cli.AdaptivePWMController()
+        first = controller.check_safety()
+        first["safe"] = False
+        first["violations"].append("injected")
+        first["limits"]["max_temperature"] = 0
+        second = controller.check_safety()
+        assert second == {"safe": True, "violations": [], "limits": controller.safety._asdict()}
+        assert json.loads(json.dumps(second)) == second
+
+    def test_violation(self):
+        controller = pwm_cli.AdaptivePWMController()
+        controller.parameters["temperature"] = 90.0
+        result = controller.check_safety()
+        assert result["safe"] is False
+        assert result["violations"] == ["High temperature: 90.0°C"]
+
+class TestUsageErrors:
+    def test_unknown_command(self, capsys):
+        code, _, err = run(capsys, "bogus")
+        assert code == 2
+        assert "invalid choice: 'bogus'" in err
+
+    def test_missing_option_value(self, capsys):
+        code, _, err = run(capsys, "-c")
+        assert code == 2
+        assert "expected one argument" in err
+
+    def test_unknown_global_option(self, capsys):
+        code, _, err = run(capsys, "--bogus", "status")
+        assert code == 2
+        assert "unrecognized arguments" in err
+
+    def test_extra_argument(self, capsys):
+        code, _, err = run(capsys, "stop", "extra")
+        assert code == 2
+        assert "unrecognized arguments: extra" in err
+
+    def test_invalid_value(self, capsys):
+        code, _, err = run(capsys, "set", "duty_cycle", "abc")
+        assert code == 2
+        assert "invalid float value: 'abc'" in err
+
+    def test_missing_positional(self, capsys):
+        code, _, err = run(capsys, "set", "duty_cycle")
+        assert code == 2
+        assert "required" in err
+
+    def test_checked_before_authentication(self, capsys, monkeypatch):
+        deny_authentication(monkeypatch)
+        code, _, err = run(capsys, "status", "--bogus")
+        assert code == 2
+        assert "unrecognized arguments: --bogus" in err
+
+class TestHelp:
+    def test_no_command_prints_help(self, capsys):
+        code, out, _ = run(capsys)
+        assert code == 0
+        assert "AdaptivePWM CLI Controller" in out
+        for name, (_, _, help_text, _) in pwm_cli.COMMANDS.items():
+            assert f"{name:<10} {help_text}" in out
+
+    def test_help_option(self, capsys):
+        code, out, _ = run(capsys, "-h")
+        assert code == 0
+        assert "--config CONFIG" in out
+        assert "commands:" in out
+
+    def test_command_help(self, capsys, monkeypatch):
+        deny_authentication(monkeypatch)
+        code, out, _ = run(capsys, "status", "-h")
+        assert code == 0
+        assert "status [-h] [--json]" in out
+
+    def test_command_help_after_flags(self, capsys, monkeypatch):
+        deny_authentication(monkeypatch)
+        code, out, _ = run(capsys, "config", "--show", "-h")
+        assert code == 0
+        assert "config [-h] [--show] [--save]" in out
+
+    def test_flagless_command_help(self, capsys, monkeypatch):
+        deny_authentication(monkeypatch)
+        code, out, _ = run(capsys, "safety", "-h")
+        assert code == 0
+        assert "Check safety status" in out
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])